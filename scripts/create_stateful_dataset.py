@@ -1,5 +1,4 @@
 import argparse
-import json
 import os
 import random
 
@@ -7,7 +6,8 @@ import numpy as np
 from progressbar import ProgressBar
 
 import h5py
-from src.data import generate_output, import_labels, to_categorical
+from src.data import generate_output, group_videos_by_subset, import_labels, to_categorical
+from src.io_data import load_json
 
 
 def create_stateful_dataset(video_features_file,
@@ -31,15 +31,15 @@ def create_stateful_dataset(video_features_file,
 
     with open(labels, 'r') as f:
         labels = import_labels(f)
+    labels_index = {label: i for i, label in enumerate(labels)}
 
-    with open(videos_info, 'r') as f:
-        videos_data = json.load(f)
+    videos_data = load_json(videos_info)
+
+    videos_by_subset = group_videos_by_subset(videos_data)
+    stored_videos = set(f_video_features.keys())
 
     for subset in subsets:
-        videos = [
-            k for k in videos_data.keys() if videos_data[k]['subset'] == subset
-        ]
-        videos = list(set(videos) & set(f_video_features.keys()))
+        videos = list(set(videos_by_subset.get(subset, [])) & stored_videos)
         random.shuffle(videos)
 
         nb_videos = len(videos)
@@ -76,7 +76,7 @@ def create_stateful_dataset(video_features_file,
         print('Creating stateful dataset for {} subset'.format(subset))
 
         for i in range(batch_size):
-            batch_index = index // timesteps % batch_size == i
+            batch_index = index[index // timesteps % batch_size == i]
             progbar.update(i)
 
             pos = 0
@@ -87,10 +87,11 @@ def create_stateful_dataset(video_features_file,
                 nb_instances = vid_features.shape[0]
 
                 # Output
-                output_classes = generate_output(videos_data[video_id], labels)
+                output_classes = generate_output(videos_data[video_id],
+                                                 labels_index)
                 assert nb_instances == len(output_classes)
 
-                video_index = index[batch_index][pos:pos + nb_instances]
+                video_index = batch_index[pos:pos + nb_instances]
                 video_features[video_index, :] = vid_features
                 output[video_index] = to_categorical(
                     output_classes, nb_classes=output_size)
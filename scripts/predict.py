@@ -1,5 +1,4 @@
 import argparse
-import json
 import os
 
 from keras.layers import LSTM, BatchNormalization, Dense, Dropout, Input, TimeDistributed
@@ -7,6 +6,8 @@ from keras.models import Model
 from progressbar import ProgressBar
 
 import h5py
+from src.data import group_videos_by_subset
+from src.io_data import load_json
 
 
 def extract_predicted_outputs(experiment_id,
@@ -53,14 +54,13 @@ def extract_predicted_outputs(experiment_id,
     h5_dataset = h5py.File(input_dataset, 'r')
     h5_predict = h5py.File(store_path, 'w')
 
-    with open('dataset/videos.json', 'r') as f:
-        videos_info = json.load(f)
+    videos_info = load_json('dataset/videos.json')
+
+    videos_by_subset = group_videos_by_subset(videos_info)
+    stored_videos = set(h5_dataset.keys())
 
     for subset in subsets:
-        videos = [
-            v for v in videos_info.keys() if videos_info[v]['subset'] == subset
-        ]
-        videos = list(set(videos) & set(h5_dataset.keys()))
+        videos = list(set(videos_by_subset.get(subset, [])) & stored_videos)
         nb_videos = len(videos)
         print('Predicting {} subset...'.format(subset))
 
@@ -9,6 +9,7 @@ from progressbar import ProgressBar
 
 import h5py
 from src.data import import_labels
+from src.io_data import load_json
 from src.processing import activity_localization, get_classification, smoothing
 
 
@@ -31,8 +32,7 @@ def process_prediction(experiment_id,
 
     with open('dataset/labels.txt', 'r') as f:
         labels = import_labels(f)
-    with open('dataset/videos.json', 'r') as f:
-        videos_info = json.load(f)
+    videos_info = load_json('dataset/videos.json')
 
     f_predictions = h5py.File(predictions_file, 'r')
     for subset in subsets:
@@ -40,9 +40,8 @@ def process_prediction(experiment_id,
         subset_predictions = f_predictions[subset]
 
         progbar = ProgressBar(max_value=len(subset_predictions.keys()))
-        with open('dataset/templates/results_{}.json'.format(subset),
-                  'r') as f:
-            results_classification = json.load(f)
+        results_classification = load_json(
+            'dataset/templates/results_{}.json'.format(subset))
         results_detection = copy.deepcopy(results_classification)
 
         count = 0
@@ -8,63 +8,82 @@ from src.io_data import video_to_array
 
 def import_labels(f):
     ''' Read from a file all the labels from it '''
-    lines = f.readlines()
     labels = []
-    i = 0
-    for l in lines:
+    for i, l in enumerate(f):
         t = l.split('\t')
         assert int(t[0]) == i
-        label = t[1].split('\n')[0]
-        labels.append(label)
-        i += 1
+        labels.append(t[1].rstrip('\n'))
     return labels
 
 
+def group_videos_by_subset(videos_info):
+    ''' Group the ids of the videos given by the subset they belong to, going
+    through all of them only once
+    '''
+    subsets = {}
+    for video_id, info in videos_info.items():
+        subsets.setdefault(info['subset'], []).append(video_id)
+    return subsets
+
+
 def to_categorical(y, nb_classes=None):
     ''' Convert class vector (integers from 0 to nb_classes)
     to binary class matrix, for use with categorical_crossentropy.
     '''
     if not nb_classes:
         nb_classes = np.max(y) + 1
+    y = np.asarray(y, dtype=np.int64)
     Y = np.zeros((len(y), nb_classes))
-    for i in range(len(y)):
-        Y[i, y[i]] = 1.
+    Y[np.arange(len(y)), y] = 1.
     return Y
 
 
-def generate_output(video_info, labels, length=16):
+def _inside_segments(t, segments):
+    ''' Return a boolean mask of the times t which lie inside any of the
+    segments given (with both ends included). Segments may overlap
+    '''
+    order = np.argsort(segments[:, 0], kind='mergesort')
+    starts = segments[order, 0]
+    # Furthest end reached by the segments starting up to each start
+    ends = np.maximum.accumulate(segments[order, 1])
+    idx = np.searchsorted(starts, t, side='right') - 1
+    return (idx >= 0) & (t <= ends[np.maximum(idx, 0)])
+
+
+def generate_output(video_info, labels_index, length=16):
     ''' Given the info of the vide, generate a vector of classes corresponding
     the output for each clip of the video which features have been extracted.
+    The labels_index maps each label name to its output index. The classes are
+    returned as an int32 array with one entry per clip.
     '''
     nb_frames = video_info['num_frames']
-    last_first_name = nb_frames - length + 1
-
-    start_frames = range(0, last_first_name, length)
-
-    # Check the output for each frame of the video
-    outputs = ['none'] * nb_frames
-    for i in range(nb_frames):
-        # Pass frame to temporal scale
-        t = i / float(nb_frames) * video_info['duration']
-        for annotation in video_info['annotations']:
-            if t >= annotation['segment'][0] and t <= annotation['segment'][1]:
-                outputs[i] = annotation['label']
-                label = annotation['label']
-                break
-
-    instances = []
-    for start_frame in start_frames:
-        # Obtain the label for this isntance and then its output
-        output = None
-
-        outs = outputs[start_frame:start_frame + length]
-        if outs.count(label) >= length / 2:
-            output = labels.index(label)
-        else:
-            output = 0
-        instances.append(output)
-
-    return instances
+    nb_clips = nb_frames // length
+
+    # Check the output for each frame of the video. Each frame takes the first
+    # annotation (in order) whose segment contains its temporal position
+    annotations = video_info['annotations']
+    segments = np.array([a['segment'] for a in annotations], dtype=np.float64)
+    t = np.arange(nb_frames) / float(nb_frames) * video_info['duration']
+    label = annotations[0]['label']
+    same_label = np.array([a['label'] == label for a in annotations])
+    if same_label.all():
+        activity = _inside_segments(t, segments)
+    else:
+        # Annotations with different labels may overlap, so which one comes
+        # first for every frame matters
+        inside = (t >= segments[:, 0:1]) & (t <= segments[:, 1:2])
+        annotated = inside.any(axis=0)
+        frame_annotation = inside.argmax(axis=0)
+        label = annotations[frame_annotation[annotated][-1]]['label']
+        same_label = np.array([a['label'] == label for a in annotations])
+        activity = annotated & same_label[frame_annotation]
+
+    # Clips do not overlap, so the number of active frames on each of them is
+    # a sum over consecutive blocks of length frames
+    counts = activity[:nb_clips * length].reshape(nb_clips, length).sum(axis=1)
+    instances = np.where(counts >= length / 2, labels_index[label], 0)
+
+    return instances.astype(np.int32)
 
 
 class VideoGenerator(object):
@@ -1,5 +1,12 @@
+import json
+
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def video_to_array(video_path,
                    resize=None,
@@ -106,3 +113,15 @@ def get_duration(video_path):
     fps = float(cap.get(CAP_PROP_FPS))
     duration = num_frames / fps
     return duration
+
+
+def load_json(json_path):
+    ''' Load the content of the JSON file at the path given. If orjson is
+    available it is used to parse the file, which is much faster than the
+    standard library for big files as the ActivityNet annotations.
+    '''
+    if orjson is not None:
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(json_path, 'r') as f:
+        return json.load(f)